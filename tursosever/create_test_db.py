@@ -5,6 +5,10 @@ import turso
 # 创建测试数据库
 conn = turso.connect("local_tursodb/test.db")
 
+# WAL + NORMAL：建库脚本在慢速存储上也能即刻完成
+conn.execute("PRAGMA journal_mode=WAL")
+conn.execute("PRAGMA synchronous=NORMAL")
+
 # 创建用户表
 conn.execute("""
     CREATE TABLE IF NOT EXISTS users (
@@ -27,30 +31,24 @@ conn.execute("""
     )
 """)
 
-# 插入示例数据
-conn.execute(
-    "INSERT INTO users (username, email) VALUES (?, ?)", ("alice", "alice@example.com")
-)
-conn.execute(
-    "INSERT INTO users (username, email) VALUES (?, ?)", ("bob", "bob@example.com")
-)
-conn.execute(
+# 插入示例数据（executemany 只解析一次 SQL）
+conn.executemany(
     "INSERT INTO users (username, email) VALUES (?, ?)",
-    ("charlie", "charlie@example.com"),
+    [
+        ("alice", "alice@example.com"),
+        ("bob", "bob@example.com"),
+        ("charlie", "charlie@example.com"),
+    ],
 )
 
 # 插入示例帖子
-conn.execute(
-    "INSERT INTO posts (user_id, title, content) VALUES (?, ?, ?)",
-    (1, "First Post", "This is Alice's first post"),
-)
-conn.execute(
-    "INSERT INTO posts (user_id, title, content) VALUES (?, ?, ?)",
-    (1, "Second Post", "This is Alice's second post"),
-)
-conn.execute(
+conn.executemany(
     "INSERT INTO posts (user_id, title, content) VALUES (?, ?, ?)",
-    (2, "Bob's Post", "This is Bob's first post"),
+    [
+        (1, "First Post", "This is Alice's first post"),
+        (1, "Second Post", "This is Alice's second post"),
+        (2, "Bob's Post", "This is Bob's first post"),
+    ],
 )
 
 conn.commit()
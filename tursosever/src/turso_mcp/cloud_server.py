@@ -1,16 +1,276 @@
 """支持同步功能的云端 TursoDB MCP 服务。"""
 
+import asyncio
+import concurrent.futures
 import os
-from typing import Any, Optional
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Literal, Optional
 from mcp.server.fastmcp import FastMCP
 import turso.sync
 
+from .database import (
+    _DDL_RE,
+    _LIST_TABLES_SQL,
+    _delete_sql,
+    _insert_sql,
+    _is_read_only,
+    _update_sql,
+    _validate_identifiers,
+)
+
 # 创建 MCP 服务
 mcp = FastMCP("turso-cloud")
 
-# 云端数据库的全局连接
-cloud_connection = None
-cloud_config = {"path": None, "remote_url": None, "remote_auth_token": None}
+# 连接级性能 PRAGMA：同步连接自行管理 WAL，因此跳过 journal_mode
+_PRAGMAS = [
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    # 默认 1000 页的自动检查点会在查询中途造成延迟尖峰，调大以减少触发频率
+    "PRAGMA wal_autocheckpoint=10000",
+]
+
+# PRAGMA optimize 的最小执行间隔（秒）
+_OPTIMIZE_INTERVAL = 900.0
+
+def _apply_pragmas(connection):
+    """对新打开的同步连接逐条尽力应用性能 PRAGMA。
+
+    旧版 pyturso（如 0.4.4）不识别部分 PRAGMA 名称，失败的直接跳过。
+    """
+    for pragma in _PRAGMAS:
+        try:
+            connection.execute(pragma)
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """指向同一同步数据库的小型连接池。
+
+    WAL 允许多个读取器并发执行，但同一时刻只能有一个写入器，
+    因此读取工具从队列中取任意连接，写入工具独占专用的写连接。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        remote_url: str,
+        auth_token: str,
+        size: Optional[int] = None,
+    ):
+        self.path = path
+        self.remote_url = remote_url
+        self._auth_token = auth_token
+
+        if size is None:
+            size = os.cpu_count() or 1
+
+        # 每个连接配一个常驻游标，避免每次 execute 都分配新的 Cursor 对象
+        self._cursors: dict[int, Any] = {}
+        self._writer = self._open()
+        self._writer_lock = threading.Lock()
+        self._readers: queue.Queue = queue.Queue()
+        for _ in range(size):
+            self._readers.put(self._open())
+        self._last_optimize = time.monotonic()
+
+    def _open(self):
+        connection = turso.sync.connect(
+            path=self.path, remote_url=self.remote_url, auth_token=self._auth_token
+        )
+        _apply_pragmas(connection)
+        # SQLite 文档建议在打开连接后运行一次 PRAGMA optimize（尽力而为）
+        try:
+            connection.execute("PRAGMA optimize")
+        except Exception:
+            pass
+        self._cursors[id(connection)] = connection.cursor()
+        return connection
+
+    def cursor(self, connection):
+        """返回与连接绑定的常驻游标。"""
+        return self._cursors[id(connection)]
+
+    def maybe_optimize(self, connection):
+        """每隔一段时间尽力运行 PRAGMA optimize，保持查询计划统计新鲜。
+
+        纯属锦上添花：失败（如旧版 pyturso 不支持）不能影响调用方。
+        """
+        now = time.monotonic()
+        if now - self._last_optimize >= _OPTIMIZE_INTERVAL:
+            self._last_optimize = now
+            try:
+                connection.execute("PRAGMA optimize")
+            except Exception:
+                pass
+
+    @contextmanager
+    def reader(self):
+        """借出一个只读连接，用完归还队列。"""
+        connection = self._readers.get()
+        try:
+            yield connection
+        finally:
+            self._readers.put(connection)
+
+    @contextmanager
+    def writer(self):
+        """独占写连接（同步操作也走这里，避免与写入交错）。"""
+        with self._writer_lock:
+            yield self._writer
+
+    def close(self):
+        """关闭池中的所有连接。"""
+        self._cursors.clear()
+        self._writer.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+
+
+# 写线程单批最多合并的语句数 / 收集窗口（秒）
+_WRITE_BATCH_MAX = 32
+_WRITE_BATCH_WINDOW = 0.005
+
+
+class WriterThread:
+    """专用写线程：把短窗口内到达的多个写请求合并进同一个事务。
+
+    SQLite 本就只允许一个写入器，串行化不损失并发；合并提交则把
+    N 个客户端写操作的 N 次 fsync 压成一次。
+    """
+
+    def __init__(self, pool: ConnectionPool):
+        self._pool = pool
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, sql: str, params: Optional[list]) -> concurrent.futures.Future:
+        """把一条写语句排入队列，返回承载 (lastrowid, rowcount) 的 Future。"""
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._queue.put((sql, params, future))
+        return future
+
+    def stop(self):
+        """处理完队列中已有的请求后退出线程。"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _drain(self) -> list:
+        """阻塞取第一条请求，然后在时间窗口内继续收集后到的请求。"""
+        batch = [self._queue.get()]
+        if batch[0] is None:
+            return batch
+        deadline = time.monotonic() + _WRITE_BATCH_WINDOW
+        while len(batch) < _WRITE_BATCH_MAX:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            if item is None:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._drain()
+            stopping = batch[-1] is None
+            if stopping:
+                batch.pop()
+            if batch:
+                try:
+                    self._commit_batch(batch)
+                except Exception as e:
+                    # 意外异常不能杀死写线程：否则后续写请求会永远挂起。
+                    # 把错误交给本批尚未完成的请求，线程继续服务
+                    for _, _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+            if stopping:
+                return
+
+    def _commit_batch(self, batch: list):
+        with self._pool.writer() as conn:
+            cursor = self._pool.cursor(conn)
+            try:
+                cursor.execute("BEGIN")
+                results = []
+                for sql, params, _ in batch:
+                    if params:
+                        cursor.execute(sql, params)
+                    else:
+                        cursor.execute(sql)
+                    results.append((cursor.lastrowid, cursor.rowcount))
+                conn.commit()
+            except Exception:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                # 批内某条语句失败：回退为逐条独立事务，把错误归因到具体请求
+                self._commit_individually(conn, cursor, batch)
+                return
+            # 提交已经持久化，先兑现所有 Future，之后的收尾工作再失败也不受影响
+            for (_, _, future), result in zip(batch, results):
+                future.set_result(result)
+            self._pool.maybe_optimize(conn)
+
+    def _commit_individually(self, conn, cursor, batch: list):
+        for sql, params, future in batch:
+            try:
+                if params:
+                    cursor.execute(sql, params)
+                else:
+                    cursor.execute(sql)
+                conn.commit()
+                future.set_result((cursor.lastrowid, cursor.rowcount))
+            except Exception as e:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                future.set_exception(e)
+
+
+@dataclass(slots=True)
+class CloudConfig:
+    """当前云端数据库的连接配置（slots 属性访问比字典查找更快）。"""
+
+    path: Optional[str] = None
+    remote_url: Optional[str] = None
+    remote_auth_token: Optional[str] = None
+
+
+# 云端数据库的全局连接池与写线程
+cloud_pool: Optional[ConnectionPool] = None
+cloud_writer: Optional[WriterThread] = None
+cloud_config = CloudConfig()
+
+# describe_table 结果缓存：(数据库路径, 表名) -> (schema_version, 结果字典)
+_desc_cache: dict[tuple[str, str], tuple[int, dict[str, Any]]] = {}
+
+# 进行中的 push/pull 任务：后到的调用加入同一任务，避免重复的网络往返
+_inflight_sync: dict[str, asyncio.Task] = {}
+
+
+async def _run_coalesced(kind: str, func):
+    """在线程中执行同步操作；若同类操作已在进行则直接等待其结果。"""
+    task = _inflight_sync.get(kind)
+    if task is None or task.done():
+        task = asyncio.create_task(asyncio.to_thread(func))
+        _inflight_sync[kind] = task
+    return await task
 
 
 @mcp.tool()
@@ -27,7 +287,7 @@ def open_database(
     返回:
         包含成功状态和消息的字典
     """
-    global cloud_connection, cloud_config
+    global cloud_pool, cloud_writer
 
     try:
         # 如果未提供令牌，则使用环境变量
@@ -40,14 +300,22 @@ def open_database(
             }
 
         # 存储配置
-        cloud_config["path"] = path
-        cloud_config["remote_url"] = remote_url
-        cloud_config["remote_auth_token"] = auth_token
-
-        # 打开连接
-        cloud_connection = turso.sync.connect(
+        cloud_config.path = path
+        cloud_config.remote_url = remote_url
+        cloud_config.remote_auth_token = auth_token
+
+        # 打开连接池（读取器并发 + 单写入器）；先清掉全局引用，
+        # 这样中途失败时不会留下指向已关闭池或已停止写线程的引用
+        if cloud_writer is not None:
+            cloud_writer.stop()
+            cloud_writer = None
+        if cloud_pool is not None:
+            cloud_pool.close()
+            cloud_pool = None
+        cloud_pool = ConnectionPool(
             path=path, remote_url=remote_url, auth_token=auth_token
         )
+        cloud_writer = WriterThread(cloud_pool)
 
         return {
             "success": True,
@@ -56,6 +324,20 @@ def open_database(
             "message": f"云端数据库打开成功: {path} -> {remote_url}",
         }
     except Exception as e:
+        # 打开失败时回收残留状态：否则后续读操作会对着已关闭的连接报错，
+        # 写操作会挂在一个没有线程消费的队列上永远等待
+        if cloud_writer is not None:
+            try:
+                cloud_writer.stop()
+            except Exception:
+                pass
+            cloud_writer = None
+        if cloud_pool is not None:
+            try:
+                cloud_pool.close()
+            except Exception:
+                pass
+            cloud_pool = None
         return {
             "success": False,
             "error": str(e),
@@ -70,14 +352,14 @@ def current_database() -> dict[str, Any]:
     返回:
         包含连接状态和数据库信息的字典
     """
-    if cloud_connection is None:
+    if cloud_pool is None:
         return {"connected": False, "message": "当前没有打开的云端数据库"}
 
     return {
         "connected": True,
-        "local_path": cloud_config.get("path"),
-        "remote_url": cloud_config.get("remote_url"),
-        "message": f"已连接到云端数据库: {cloud_config.get('remote_url')}",
+        "local_path": cloud_config.path,
+        "remote_url": cloud_config.remote_url,
+        "message": f"已连接到云端数据库: {cloud_config.remote_url}",
     }
 
 
@@ -88,14 +370,14 @@ def list_tables() -> dict[str, Any]:
     返回:
         包含表名列表的字典
     """
-    if cloud_connection is None:
+    if cloud_pool is None:
         return {"success": False, "error": "当前没有打开的云端数据库"}
 
     try:
-        cursor = cloud_connection.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
-        )
-        tables = [row[0] for row in cursor.fetchall()]
+        with cloud_pool.reader() as conn:
+            cursor = cloud_pool.cursor(conn)
+            cursor.execute(_LIST_TABLES_SQL)
+            tables = [row[0] for row in cursor.fetchall()]
         return {"success": True, "tables": tables, "count": len(tables)}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -111,100 +393,152 @@ def describe_table(table_name: str) -> dict[str, Any]:
     返回:
         包含列和索引信息的字典
     """
-    if cloud_connection is None:
+    if cloud_pool is None:
         return {"success": False, "error": "当前没有打开的云端数据库"}
 
-    try:
-        # 获取表信息
-        cursor = cloud_connection.execute(f"PRAGMA table_info({table_name})")
-        columns = []
-        for row in cursor.fetchall():
-            columns.append(
-                {
-                    "cid": row[0],
-                    "name": row[1],
-                    "type": row[2],
-                    "notnull": bool(row[3]),
-                    "default_value": row[4],
-                    "pk": bool(row[5]),
-                }
-            )
-
-        # 获取索引
-        cursor = cloud_connection.execute(f"PRAGMA index_list({table_name})")
-        indexes = []
-        for row in cursor.fetchall():
-            index_name = row[1]
-            cursor2 = cloud_connection.execute(f"PRAGMA index_info({index_name})")
-            index_columns = [r[2] for r in cursor2.fetchall()]
-            indexes.append(
-                {"name": index_name, "unique": bool(row[2]), "columns": index_columns}
-            )
+    error = _validate_identifiers(table_name)
+    if error:
+        return {"success": False, "error": error}
 
-        return {
+    try:
+        with cloud_pool.reader() as conn:
+            cursor = cloud_pool.cursor(conn)
+
+            # 模式未变化时直接返回缓存结果，省掉 2 + N 个 PRAGMA 查询
+            cursor.execute("PRAGMA schema_version")
+            schema_version = cursor.fetchone()[0]
+            cache_key = (cloud_config.path, table_name)
+            cached = _desc_cache.get(cache_key)
+            if cached is not None and cached[0] == schema_version:
+                return cached[1]
+
+            # 获取表信息
+            cursor.execute(f"PRAGMA table_info({table_name})")
+            columns = []
+            for row in cursor.fetchall():
+                columns.append(
+                    {
+                        "cid": row[0],
+                        "name": row[1],
+                        "type": row[2],
+                        "notnull": bool(row[3]),
+                        "default_value": row[4],
+                        "pk": bool(row[5]),
+                    }
+                )
+
+            # 获取索引
+            cursor.execute(f"PRAGMA index_list({table_name})")
+            indexes = []
+            # index_list 的结果已被 fetchall 取尽，可以安全复用同一游标
+            for row in cursor.fetchall():
+                index_name = row[1]
+                cursor.execute(f"PRAGMA index_info({index_name})")
+                index_columns = [r[2] for r in cursor.fetchall()]
+                indexes.append(
+                    {"name": index_name, "unique": bool(row[2]), "columns": index_columns}
+                )
+
+        result = {
             "success": True,
             "table_name": table_name,
             "columns": columns,
             "indexes": indexes,
         }
+        _desc_cache[cache_key] = (schema_version, result)
+        return result
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
 @mcp.tool()
-def execute_query(query: str, params: Optional[list] = None) -> dict[str, Any]:
+def execute_query(
+    query: str,
+    params: Optional[list] = None,
+    limit: Optional[int] = None,
+    format: Literal["rows", "columnar"] = "rows",
+) -> dict[str, Any]:
     """执行只读的 SELECT 查询。
 
     参数:
         query: 要执行的 SQL SELECT 或 PRAGMA 查询
         params: 可选的查询参数列表
+        limit: 可选的最大返回行数（超出时结果带 truncated=True）
+        format: 'rows' 返回字典列表；'columnar' 返回列式 data
+            （每列一个列表，宽结果集下比字典列表快数倍）
 
     返回:
-        包含查询结果（列和行）的字典
+        包含查询结果的字典
     """
-    if cloud_connection is None:
+    if cloud_pool is None:
         return {"success": False, "error": "当前没有打开的云端数据库"}
 
-    # 确保查询是只读的
-    query_upper = query.strip().upper()
-    if not query_upper.startswith("SELECT") and not query_upper.startswith("PRAGMA"):
-        return {"success": False, "error": "只允许 SELECT 和 PRAGMA 查询"}
-
-    try:
-        if params:
-            cursor = cloud_connection.execute(query, params)
-        else:
-            cursor = cloud_connection.execute(query)
-
-        # 获取列名
-        if cursor.description:
-            columns = [desc[0] for desc in cursor.description]
-        else:
-            columns = []
-
-        # 获取行数据
-        rows = cursor.fetchall()
+    if format not in ("rows", "columnar"):
+        return {"success": False, "error": f"未知的输出格式: {format}"}
 
-        # 转换为字典列表
-        results = []
-        for row in rows:
-            result = {}
-            for i, col in enumerate(columns):
-                result[col] = row[i]
-            results.append(result)
+    if limit is not None and limit < 0:
+        return {"success": False, "error": f"limit 不能为负数: {limit}"}
 
+    # 确保查询是只读的（只检查语句开头和 WITH 的主体关键字）
+    if not _is_read_only(query):
         return {
+            "success": False,
+            "error": "只允许 SELECT、PRAGMA 和以 SELECT 为主体的 WITH 查询",
+        }
+
+    try:
+        with cloud_pool.reader() as conn:
+            cloud_pool.maybe_optimize(conn)
+            cursor = cloud_pool.cursor(conn)
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+
+            # 获取列名（intern 后每行的字典键哈希只算一次）
+            if cursor.description:
+                columns = [sys.intern(desc[0]) for desc in cursor.description]
+            else:
+                columns = []
+
+            # 分块拉取行数据，峰值内存只与块大小相关，而不是整个结果集的两倍；
+            # zip/dict 在 C 层执行，避免逐列的解释器循环
+            cursor.arraysize = 1000
+            results: list = []
+            truncated = False
+            while chunk := cursor.fetchmany(1000):
+                if format == "columnar":
+                    results.extend(chunk)
+                else:
+                    results.extend(dict(zip(columns, row)) for row in chunk)
+                if limit is not None and len(results) >= limit:
+                    # 多取一行以判断是否被截断
+                    truncated = len(results) > limit or cursor.fetchone() is not None
+                    del results[limit:]
+                    break
+
+        response = {
             "success": True,
             "columns": columns,
-            "rows": results,
             "count": len(results),
         }
+        if format == "columnar":
+            # 列式布局：C 个列表而不是 N 个字典，转置由 zip 在 C 层完成
+            if results:
+                response["data"] = [list(col) for col in zip(*results)]
+            else:
+                response["data"] = [[] for _ in columns]
+        else:
+            response["rows"] = results
+        if limit is not None:
+            response["truncated"] = truncated
+        return response
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
 @mcp.tool()
-def insert_data(table: str, data: dict[str, Any]) -> dict[str, Any]:
+async def insert_data(table: str, data: dict[str, Any]) -> dict[str, Any]:
     """向表中插入数据。
 
     参数:
@@ -214,23 +548,20 @@ def insert_data(table: str, data: dict[str, Any]) -> dict[str, Any]:
     返回:
         包含成功状态和行 ID 的字典
     """
-    if cloud_connection is None:
+    if cloud_pool is None:
         return {"success": False, "error": "当前没有打开的云端数据库"}
 
-    try:
-        columns = list(data.keys())
-        placeholders = ", ".join(["?" for _ in columns])
-        columns_str = ", ".join(columns)
+    error = _validate_identifiers(table, data.keys())
+    if error:
+        return {"success": False, "error": error}
 
-        query = f"INSERT INTO {table} ({columns_str}) VALUES ({placeholders})"
+    try:
+        columns = tuple(data.keys())
+        query = _insert_sql(table, columns)
         values = [data[col] for col in columns]
 
-        cloud_connection.execute(query, values)
-        cloud_connection.commit()
-
-        # 获取最后插入的行 ID
-        cursor = cloud_connection.execute("SELECT last_insert_rowid()")
-        last_id = cursor.fetchone()[0]
+        # 写线程会把同一窗口内的多个写请求合并进一次提交
+        last_id, _ = await asyncio.wrap_future(cloud_writer.submit(query, values))
 
         return {
             "success": True,
@@ -242,7 +573,67 @@ def insert_data(table: str, data: dict[str, Any]) -> dict[str, Any]:
 
 
 @mcp.tool()
-def update_data(
+def insert_many(table: str, rows: list[dict[str, Any]]) -> dict[str, Any]:
+    """在单个事务中批量插入多行数据。
+
+    参数:
+        table: 要插入数据的表名
+        rows: 字典列表，每个字典包含列名和值（所有行的列必须一致）
+
+    返回:
+        包含成功状态、插入行数和最后行 ID 的字典
+    """
+    if cloud_pool is None:
+        return {"success": False, "error": "当前没有打开的云端数据库"}
+
+    if not rows:
+        return {"success": False, "error": "rows 不能为空"}
+
+    error = _validate_identifiers(table, rows[0].keys())
+    if error:
+        return {"success": False, "error": error}
+
+    with cloud_pool.writer() as conn:
+        try:
+            columns = list(rows[0].keys())
+            columns_str = ", ".join(columns)
+            row_sql = "(" + ", ".join(["?" for _ in columns]) + ")"
+            values = [[row[col] for col in columns] for row in rows]
+
+            # 多行 VALUES 打包：每条语句最多 999 个参数，
+            # 把每行一次的 SQL 调度摊薄为每 K 行一次
+            chunk_size = max(1, 999 // len(columns))
+
+            # 单个事务只需一次 fsync，而不是每行一次
+            cursor = cloud_pool.cursor(conn)
+            cursor.execute("BEGIN")
+            for start in range(0, len(rows), chunk_size):
+                batch = values[start : start + chunk_size]
+                query = (
+                    f"INSERT INTO {table} ({columns_str}) VALUES "
+                    + ", ".join([row_sql] * len(batch))
+                )
+                cursor.execute(query, [v for row in batch for v in row])
+            last_id = cursor.lastrowid
+            conn.commit()
+            cloud_pool.maybe_optimize(conn)
+
+            return {
+                "success": True,
+                "message": f"成功插入 {len(rows)} 行到表 {table}",
+                "rows_inserted": len(rows),
+                "last_row_id": last_id,
+            }
+        except Exception as e:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            return {"success": False, "error": str(e)}
+
+
+@mcp.tool()
+async def update_data(
     table: str, data: dict[str, Any], where: str, where_params: Optional[list] = None
 ) -> dict[str, Any]:
     """更新表中已有的数据。
@@ -256,31 +647,34 @@ def update_data(
     返回:
         包含成功状态和受影响行数的字典
     """
-    if cloud_connection is None:
+    if cloud_pool is None:
         return {"success": False, "error": "当前没有打开的云端数据库"}
 
+    error = _validate_identifiers(table, data.keys())
+    if error:
+        return {"success": False, "error": error}
+
     try:
-        set_clause = ", ".join([f"{col} = ?" for col in data.keys()])
-        query = f"UPDATE {table} SET {set_clause} WHERE {where}"
+        query = _update_sql(table, tuple(data.keys()), where)
 
         values = list(data.values())
         if where_params:
             values.extend(where_params)
 
-        cursor = cloud_connection.execute(query, values)
-        cloud_connection.commit()
+        # 写线程会把同一窗口内的多个写请求合并进一次提交
+        _, rows_affected = await asyncio.wrap_future(cloud_writer.submit(query, values))
 
         return {
             "success": True,
             "message": f"表 {table} 中的数据更新成功",
-            "rows_affected": cursor.rowcount,
+            "rows_affected": rows_affected,
         }
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
 @mcp.tool()
-def delete_data(
+async def delete_data(
     table: str, where: str, where_params: Optional[list] = None
 ) -> dict[str, Any]:
     """从表中删除数据。
@@ -293,23 +687,25 @@ def delete_data(
     返回:
         包含成功状态和受影响行数的字典
     """
-    if cloud_connection is None:
+    if cloud_pool is None:
         return {"success": False, "error": "当前没有打开的云端数据库"}
 
-    try:
-        query = f"DELETE FROM {table} WHERE {where}"
+    error = _validate_identifiers(table)
+    if error:
+        return {"success": False, "error": error}
 
-        if where_params:
-            cursor = cloud_connection.execute(query, where_params)
-        else:
-            cursor = cloud_connection.execute(query)
+    try:
+        query = _delete_sql(table, where)
 
-        cloud_connection.commit()
+        # 写线程会把同一窗口内的多个写请求合并进一次提交
+        _, rows_affected = await asyncio.wrap_future(
+            cloud_writer.submit(query, where_params)
+        )
 
         return {
             "success": True,
             "message": f"成功从表 {table} 中删除数据",
-            "rows_affected": cursor.rowcount,
+            "rows_affected": rows_affected,
         }
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -325,57 +721,72 @@ def schema_change(sql: str) -> dict[str, Any]:
     返回:
         包含成功状态的字典
     """
-    if cloud_connection is None:
+    if cloud_pool is None:
         return {"success": False, "error": "当前没有打开的云端数据库"}
 
-    # 验证是否为 DDL 语句
-    sql_upper = sql.strip().upper()
-    allowed_prefixes = ["CREATE", "ALTER", "DROP"]
-
-    if not any(sql_upper.startswith(prefix) for prefix in allowed_prefixes):
+    # 验证是否为 DDL 语句（正则只看语句开头，与 SQL 长度无关）
+    if not _DDL_RE.match(sql):
         return {
             "success": False,
             "error": "只允许 CREATE、ALTER 和 DROP 语句",
         }
 
     try:
-        cloud_connection.execute(sql)
-        cloud_connection.commit()
+        with cloud_pool.writer() as conn:
+            cloud_pool.cursor(conn).execute(sql)
+            conn.commit()
+        _desc_cache.clear()
 
         return {"success": True, "message": "模式修改执行成功"}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+def _do_push():
+    with cloud_pool.writer() as conn:
+        conn.push()
+
+
+def _do_pull():
+    with cloud_pool.writer() as conn:
+        return conn.pull()
+
+
 @mcp.tool()
-def push() -> dict[str, Any]:
+async def push() -> dict[str, Any]:
     """将本地更改推送到云端。
 
+    网络 I/O 在线程中执行，不阻塞其他工具调用；
+    若已有 push 在进行，本次调用直接等待其完成。
+
     返回:
         包含成功状态的字典
     """
-    if cloud_connection is None:
+    if cloud_pool is None:
         return {"success": False, "error": "当前没有打开的云端数据库"}
 
     try:
-        cloud_connection.push()
+        await _run_coalesced("push", _do_push)
         return {"success": True, "message": "更改成功推送到云端"}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
 @mcp.tool()
-def pull() -> dict[str, Any]:
+async def pull() -> dict[str, Any]:
     """从云端拉取远程更改。
 
+    网络 I/O 在线程中执行，不阻塞其他工具调用；
+    若已有 pull 在进行，本次调用直接等待其完成。
+
     返回:
         包含成功状态和是否收到更改的字典
     """
-    if cloud_connection is None:
+    if cloud_pool is None:
         return {"success": False, "error": "当前没有打开的云端数据库"}
 
     try:
-        changed = cloud_connection.pull()
+        changed = await _run_coalesced("pull", _do_pull)
         return {
             "success": True,
             "changed": changed,
@@ -390,14 +801,28 @@ def checkpoint() -> dict[str, Any]:
     """压缩本地 WAL 以限制磁盘使用。
 
     返回:
-        包含成功状态的字典
+        包含成功状态、检查点进度和当前 WAL 大小的字典
+        （main_wal_size 可作为调用方触发检查点的阈值依据）
     """
-    if cloud_connection is None:
+    if cloud_pool is None:
         return {"success": False, "error": "当前没有打开的云端数据库"}
 
     try:
-        cloud_connection.checkpoint()
-        return {"success": True, "message": "检查点完成"}
+        with cloud_pool.writer() as conn:
+            conn.checkpoint()
+            # TRUNCATE 模式把 WAL 截断归零，并返回可观测的进度计数
+            cursor = cloud_pool.cursor(conn)
+            cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            row = cursor.fetchone()
+            stats = conn.stats()
+        return {
+            "success": True,
+            "busy": row[0],
+            "log_frames": row[1],
+            "checkpointed": row[2],
+            "main_wal_size": stats.main_wal_size,
+            "message": "检查点完成",
+        }
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -409,11 +834,12 @@ def sync_stats() -> dict[str, Any]:
     返回:
         包含同步统计信息的字典
     """
-    if cloud_connection is None:
+    if cloud_pool is None:
         return {"success": False, "error": "当前没有打开的云端数据库"}
 
     try:
-        stats = cloud_connection.stats()
+        with cloud_pool.writer() as conn:
+            stats = conn.stats()
         return {
             "success": True,
             "stats": {
@@ -1,8 +1,124 @@
 """TursoDB MCP 服务的共享数据库工具类。"""
 
-from typing import Any, Optional
+import re
+import sys
+import time
+from functools import lru_cache
+from typing import Any, Literal, Optional
 import turso
 
+# 连接级性能 PRAGMA：提交路径以 fsync 为瓶颈，WAL + NORMAL 可大幅降低每次提交的延迟
+_PRAGMAS = [
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    # 默认 1000 页的自动检查点会在查询中途造成延迟尖峰，调大以减少触发频率
+    "PRAGMA wal_autocheckpoint=10000",
+]
+
+# PRAGMA optimize 的最小执行间隔（秒）
+_OPTIMIZE_INTERVAL = 900.0
+
+# 复用同一 SQL 文本，让 libsql 的语句缓存命中
+_LIST_TABLES_SQL = "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
+
+# SQL 标识符白名单：防止注入，同时让相同形状的 SQL 可被语句缓存复用
+_IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+# 只匹配语句开头，避免对大查询做整串 upper() 拷贝
+_READ_RE = re.compile(r"\s*(?:SELECT|PRAGMA)\b", re.IGNORECASE)
+_WITH_RE = re.compile(r"\s*WITH\b", re.IGNORECASE)
+_DDL_RE = re.compile(r"\s*(?:CREATE|ALTER|DROP)\b", re.IGNORECASE)
+_WORD_RE = re.compile(r"[A-Za-z_]+")
+
+# CTE 列表之后可能出现的主语句关键字
+_MAIN_KEYWORDS = frozenset({"SELECT", "VALUES", "INSERT", "UPDATE", "DELETE", "REPLACE"})
+
+
+def _with_main_keyword(query: str, start: int) -> str:
+    """扫过括号平衡的 CTE 定义，返回 WITH 语句主体的首个关键字（大写）。
+
+    跳过字符串字面量和引用标识符，避免其中的括号干扰配对计数；
+    找不到主关键字时返回空串。
+    """
+    depth = 0
+    i = start
+    n = len(query)
+    while i < n:
+        ch = query[i]
+        if ch in "'\"`":
+            # 字符串/引用标识符：引号以双写转义
+            i += 1
+            while i < n:
+                if query[i] == ch:
+                    if i + 1 < n and query[i + 1] == ch:
+                        i += 2
+                        continue
+                    break
+                i += 1
+        elif ch == "[":
+            i = query.find("]", i + 1)
+            if i == -1:
+                return ""
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif depth == 0 and (ch.isalpha() or ch == "_"):
+            match = _WORD_RE.match(query, i)
+            word = match.group(0).upper()
+            if word in _MAIN_KEYWORDS:
+                return word
+            i = match.end() - 1
+        i += 1
+    return ""
+
+
+def _is_read_only(query: str) -> bool:
+    """判断查询是否只读。
+
+    SELECT/PRAGMA 开头的语句只读；WITH 语句要求 CTE 列表之后的主体是
+    SELECT/VALUES —— SQLite 允许 CTE 前缀的 INSERT/UPDATE/DELETE，
+    那是写语句，必须拒绝。
+    """
+    if _READ_RE.match(query):
+        return True
+    match = _WITH_RE.match(query)
+    if match:
+        return _with_main_keyword(query, match.end()) in ("SELECT", "VALUES")
+    return False
+
+
+# 按 (表, 列) 形状缓存生成的 SQL：相同形状的高频调用无需重复拼接字符串，
+# 并且复用同一字符串对象让 libsql 的语句缓存命中（调用前须通过标识符校验）
+@lru_cache(maxsize=256)
+def _insert_sql(table: str, columns: tuple[str, ...]) -> str:
+    placeholders = ", ".join(["?" for _ in columns])
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+@lru_cache(maxsize=256)
+def _update_sql(table: str, columns: tuple[str, ...], where: str) -> str:
+    set_clause = ", ".join([f"{col} = ?" for col in columns])
+    return f"UPDATE {table} SET {set_clause} WHERE {where}"
+
+
+@lru_cache(maxsize=256)
+def _delete_sql(table: str, where: str) -> str:
+    return f"DELETE FROM {table} WHERE {where}"
+
+
+def _validate_identifiers(table: str, columns=()) -> Optional[str]:
+    """校验表名和列名是否为合法标识符，非法时返回错误信息。"""
+    if not _IDENT_RE.match(table):
+        return f"非法的表名: {table}"
+    for col in columns:
+        if not _IDENT_RE.match(col):
+            return f"非法的列名: {col}"
+    return None
+
 
 class DatabaseManager:
     """管理 Turso 数据库连接和操作。"""
@@ -10,18 +126,91 @@ class DatabaseManager:
     def __init__(self):
         self.connection: Optional[turso.Connection] = None
         self.db_path: Optional[str] = None
+        # 复用同一个游标，避免每次 execute 都分配新的 Cursor 对象
+        self._cursor = None
+        self._pragmas_applied = False
+        # describe_table 结果缓存：表名 -> (schema_version, 结果字典)
+        self._desc_cache: dict[str, tuple[int, dict[str, Any]]] = {}
+        self._last_optimize = time.monotonic()
+        # 显式事务进行中时，写操作跳过各自的内部提交
+        self._in_tx = False
+
+    def _maybe_optimize(self):
+        """每隔一段时间尽力运行 PRAGMA optimize，保持查询计划统计新鲜。
+
+        纯属锦上添花：失败（如旧版 pyturso 不支持）不能影响调用方，
+        尤其不能让已成功提交的写操作被报告为失败。
+        """
+        now = time.monotonic()
+        if now - self._last_optimize >= _OPTIMIZE_INTERVAL:
+            self._last_optimize = now
+            try:
+                self._execute("PRAGMA optimize")
+            except Exception:
+                pass
+
+    def _execute(self, sql: str, params: Optional[list] = None):
+        """用共享游标执行 SQL 并返回该游标。"""
+        if params:
+            self._cursor.execute(sql, params)
+        else:
+            self._cursor.execute(sql)
+        return self._cursor
+
+    def _apply_pragmas(self, journal_mode: bool = True):
+        """对新打开的连接应用性能 PRAGMA（每次打开只执行一次）。
+
+        参数:
+            journal_mode: 是否切换到 WAL（':memory:' 等路径应跳过）
+
+        逐条尽力执行：旧版 pyturso（如 0.4.4）不识别部分 PRAGMA 名称，
+        失败的直接跳过，不能让打开数据库因此失败。
+        """
+        if self._pragmas_applied:
+            return
+        if journal_mode:
+            try:
+                self._execute("PRAGMA journal_mode=WAL")
+            except Exception:
+                pass
+        for pragma in _PRAGMAS:
+            try:
+                self._execute(pragma)
+            except Exception:
+                pass
+        self._pragmas_applied = True
 
     def open_database(self, path: str) -> dict[str, Any]:
         """打开数据库连接。"""
         try:
             self.connection = turso.connect(path)
+            self._cursor = self.connection.cursor()
             self.db_path = path
+            self._pragmas_applied = False
+            self._desc_cache.clear()
+            self._in_tx = False
+            self._apply_pragmas(journal_mode=path != ":memory:")
+            # SQLite 文档建议在打开连接后运行一次 PRAGMA optimize（尽力而为）
+            try:
+                self._execute("PRAGMA optimize")
+            except Exception:
+                pass
+            self._last_optimize = time.monotonic()
             return {
                 "success": True,
                 "path": path,
                 "message": f"数据库打开成功: {path}",
             }
         except Exception as e:
+            # 打开失败时回收已分配的连接状态，避免 current_database 误报已连接
+            if self.connection is not None:
+                try:
+                    self.connection.close()
+                except Exception:
+                    pass
+            self.connection = None
+            self._cursor = None
+            self.db_path = None
             return {
                 "success": False,
                 "error": str(e),
@@ -45,9 +234,7 @@ class DatabaseManager:
             return {"success": False, "error": "当前没有打开的数据库"}
 
         try:
-            cursor = self.connection.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
-            )
+            cursor = self._execute(_LIST_TABLES_SQL)
             tables = [row[0] for row in cursor.fetchall()]
             return {"success": True, "tables": tables, "count": len(tables)}
         except Exception as e:
@@ -58,9 +245,20 @@ class DatabaseManager:
         if self.connection is None:
             return {"success": False, "error": "当前没有打开的数据库"}
 
+        error = _validate_identifiers(table_name)
+        if error:
+            return {"success": False, "error": error}
+
         try:
+            # 模式未变化时直接返回缓存结果，省掉 2 + N 个 PRAGMA 查询
+            cursor = self._execute("PRAGMA schema_version")
+            schema_version = cursor.fetchone()[0]
+            cached = self._desc_cache.get(table_name)
+            if cached is not None and cached[0] == schema_version:
+                return cached[1]
+
             # 获取表信息
-            cursor = self.connection.execute(f"PRAGMA table_info({table_name})")
+            cursor = self._execute(f"PRAGMA table_info({table_name})")
             columns = []
             for row in cursor.fetchall():
                 columns.append(
@@ -75,11 +273,12 @@ class DatabaseManager:
                 )
 
             # 获取索引
-            cursor = self.connection.execute(f"PRAGMA index_list({table_name})")
+            cursor = self._execute(f"PRAGMA index_list({table_name})")
             indexes = []
+            # index_list 的结果已被 fetchall 取尽，可以安全复用同一游标
             for row in cursor.fetchall():
                 index_name = row[1]
-                cursor2 = self.connection.execute(f"PRAGMA index_info({index_name})")
+                cursor2 = self._execute(f"PRAGMA index_info({index_name})")
                 index_columns = [r[2] for r in cursor2.fetchall()]
                 indexes.append(
                     {
@@ -89,61 +288,128 @@ class DatabaseManager:
                     }
                 )
 
-            return {
+            result = {
                 "success": True,
                 "table_name": table_name,
                 "columns": columns,
                 "indexes": indexes,
             }
+            self._desc_cache[table_name] = (schema_version, result)
+            return result
         except Exception as e:
             return {"success": False, "error": str(e)}
 
     def execute_query(
-        self, query: str, params: Optional[list] = None
+        self,
+        query: str,
+        params: Optional[list] = None,
+        limit: Optional[int] = None,
+        format: Literal["rows", "columnar"] = "rows",
     ) -> dict[str, Any]:
         """执行只读的 SELECT 查询。"""
         if self.connection is None:
             return {"success": False, "error": "当前没有打开的数据库"}
 
-        # 确保查询是只读的
-        query_upper = query.strip().upper()
-        if not query_upper.startswith("SELECT") and not query_upper.startswith(
-            "PRAGMA"
-        ):
+        if format not in ("rows", "columnar"):
+            return {"success": False, "error": f"未知的输出格式: {format}"}
+
+        if limit is not None and limit < 0:
+            return {"success": False, "error": f"limit 不能为负数: {limit}"}
+
+        # 确保查询是只读的（只检查语句开头和 WITH 的主体关键字）
+        if not _is_read_only(query):
             return {
                 "success": False,
-                "error": "只允许 SELECT 和 PRAGMA 查询",
+                "error": "只允许 SELECT、PRAGMA 和以 SELECT 为主体的 WITH 查询",
             }
 
         try:
-            if params:
-                cursor = self.connection.execute(query, params)
-            else:
-                cursor = self.connection.execute(query)
+            self._maybe_optimize()
+            cursor = self._execute(query, params)
 
-            # 获取列名
+            # 获取列名（intern 后每行的字典键哈希只算一次）
             if cursor.description:
-                columns = [desc[0] for desc in cursor.description]
+                columns = [sys.intern(desc[0]) for desc in cursor.description]
             else:
                 columns = []
 
-            # 获取行数据
-            rows = cursor.fetchall()
-
-            # 转换为字典列表
-            results = []
-            for row in rows:
-                result = {}
-                for i, col in enumerate(columns):
-                    result[col] = row[i]
-                results.append(result)
-
-            return {
+            # 分块拉取行数据，峰值内存只与块大小相关，而不是整个结果集的两倍；
+            # zip/dict 在 C 层执行，避免逐列的解释器循环
+            cursor.arraysize = 1000
+            results: list = []
+            truncated = False
+            while chunk := cursor.fetchmany(1000):
+                if format == "columnar":
+                    results.extend(chunk)
+                else:
+                    results.extend(dict(zip(columns, row)) for row in chunk)
+                if limit is not None and len(results) >= limit:
+                    # 多取一行以判断是否被截断
+                    truncated = len(results) > limit or cursor.fetchone() is not None
+                    del results[limit:]
+                    break
+
+            response = {
                 "success": True,
                 "columns": columns,
-                "rows": results,
                 "count": len(results),
             }
+            if format == "columnar":
+                # 列式布局：C 个列表而不是 N 个字典，转置由 zip 在 C 层完成
+                if results:
+                    response["data"] = [list(col) for col in zip(*results)]
+                else:
+                    response["data"] = [[] for _ in columns]
+            else:
+                response["rows"] = results
+            if limit is not None:
+                response["truncated"] = truncated
+            return response
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    def begin_transaction(self) -> dict[str, Any]:
+        """开启显式事务，让多个写操作共享一次提交（一次 fsync）。"""
+        if self.connection is None:
+            return {"success": False, "error": "当前没有打开的数据库"}
+
+        if self._in_tx:
+            return {"success": False, "error": "已有未提交的事务"}
+
+        try:
+            self._execute("BEGIN IMMEDIATE")
+            self._in_tx = True
+            return {"success": True, "message": "事务已开启"}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    def commit_transaction(self) -> dict[str, Any]:
+        """提交由 begin_transaction 开启的事务。"""
+        if self.connection is None:
+            return {"success": False, "error": "当前没有打开的数据库"}
+
+        if not self._in_tx:
+            return {"success": False, "error": "没有进行中的事务"}
+
+        try:
+            self.connection.commit()
+            self._in_tx = False
+            return {"success": True, "message": "事务已提交"}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    def rollback_transaction(self) -> dict[str, Any]:
+        """回滚由 begin_transaction 开启的事务。"""
+        if self.connection is None:
+            return {"success": False, "error": "当前没有打开的数据库"}
+
+        if not self._in_tx:
+            return {"success": False, "error": "没有进行中的事务"}
+
+        try:
+            self.connection.rollback()
+            self._in_tx = False
+            return {"success": True, "message": "事务已回滚"}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
@@ -152,20 +418,22 @@ class DatabaseManager:
         if self.connection is None:
             return {"success": False, "error": "当前没有打开的数据库"}
 
-        try:
-            columns = list(data.keys())
-            placeholders = ", ".join(["?" for _ in columns])
-            columns_str = ", ".join(columns)
+        error = _validate_identifiers(table, data.keys())
+        if error:
+            return {"success": False, "error": error}
 
-            query = f"INSERT INTO {table} ({columns_str}) VALUES ({placeholders})"
+        try:
+            columns = tuple(data.keys())
+            query = _insert_sql(table, columns)
             values = [data[col] for col in columns]
 
-            self.connection.execute(query, values)
-            self.connection.commit()
+            cursor = self._execute(query, values)
+            if not self._in_tx:
+                self.connection.commit()
+                self._maybe_optimize()
 
-            # 获取最后插入的行 ID
-            cursor = self.connection.execute("SELECT last_insert_rowid()")
-            last_id = cursor.fetchone()[0]
+            # 直接读取 cursor.lastrowid，省掉一次 SELECT last_insert_rowid()
+            last_id = cursor.lastrowid
 
             return {
                 "success": True,
@@ -175,6 +443,59 @@ class DatabaseManager:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    def insert_many(self, table: str, rows: list[dict[str, Any]]) -> dict[str, Any]:
+        """在单个事务中批量插入多行数据。"""
+        if self.connection is None:
+            return {"success": False, "error": "当前没有打开的数据库"}
+
+        if not rows:
+            return {"success": False, "error": "rows 不能为空"}
+
+        error = _validate_identifiers(table, rows[0].keys())
+        if error:
+            return {"success": False, "error": error}
+
+        try:
+            columns = list(rows[0].keys())
+            columns_str = ", ".join(columns)
+            row_sql = "(" + ", ".join(["?" for _ in columns]) + ")"
+            values = [[row[col] for col in columns] for row in rows]
+
+            # 多行 VALUES 打包：每条语句最多 999 个参数，
+            # 把每行一次的 SQL 调度摊薄为每 K 行一次
+            chunk_size = max(1, 999 // len(columns))
+
+            # 单个事务只需一次 fsync，而不是每行一次
+            # （显式事务进行中时并入外层事务）
+            if not self._in_tx:
+                self._execute("BEGIN")
+            cursor = self._cursor
+            for start in range(0, len(rows), chunk_size):
+                batch = values[start : start + chunk_size]
+                query = (
+                    f"INSERT INTO {table} ({columns_str}) VALUES "
+                    + ", ".join([row_sql] * len(batch))
+                )
+                cursor.execute(query, [v for row in batch for v in row])
+            last_id = cursor.lastrowid
+            if not self._in_tx:
+                self.connection.commit()
+                self._maybe_optimize()
+
+            return {
+                "success": True,
+                "message": f"成功插入 {len(rows)} 行到表 {table}",
+                "rows_inserted": len(rows),
+                "last_row_id": last_id,
+            }
+        except Exception as e:
+            if not self._in_tx:
+                try:
+                    self.connection.rollback()
+                except Exception:
+                    pass
+            return {"success": False, "error": str(e)}
+
     def update_data(
         self,
         table: str,
@@ -186,16 +507,21 @@ class DatabaseManager:
         if self.connection is None:
             return {"success": False, "error": "当前没有打开的数据库"}
 
+        error = _validate_identifiers(table, data.keys())
+        if error:
+            return {"success": False, "error": error}
+
         try:
-            set_clause = ", ".join([f"{col} = ?" for col in data.keys()])
-            query = f"UPDATE {table} SET {set_clause} WHERE {where}"
+            query = _update_sql(table, tuple(data.keys()), where)
 
             values = list(data.values())
             if where_params:
                 values.extend(where_params)
 
-            cursor = self.connection.execute(query, values)
-            self.connection.commit()
+            cursor = self._execute(query, values)
+            if not self._in_tx:
+                self.connection.commit()
+                self._maybe_optimize()
 
             return {
                 "success": True,
@@ -212,15 +538,18 @@ class DatabaseManager:
         if self.connection is None:
             return {"success": False, "error": "当前没有打开的数据库"}
 
+        error = _validate_identifiers(table)
+        if error:
+            return {"success": False, "error": error}
+
         try:
-            query = f"DELETE FROM {table} WHERE {where}"
+            query = _delete_sql(table, where)
 
-            if where_params:
-                cursor = self.connection.execute(query, where_params)
-            else:
-                cursor = self.connection.execute(query)
+            cursor = self._execute(query, where_params)
 
-            self.connection.commit()
+            if not self._in_tx:
+                self.connection.commit()
+                self._maybe_optimize()
 
             return {
                 "success": True,
@@ -235,19 +564,17 @@ class DatabaseManager:
         if self.connection is None:
             return {"success": False, "error": "当前没有打开的数据库"}
 
-        # 验证是否为 DDL 语句
-        sql_upper = sql.strip().upper()
-        allowed_prefixes = ["CREATE", "ALTER", "DROP"]
-
-        if not any(sql_upper.startswith(prefix) for prefix in allowed_prefixes):
+        # 验证是否为 DDL 语句（正则只看语句开头，与 SQL 长度无关）
+        if not _DDL_RE.match(sql):
             return {
                 "success": False,
                 "error": "只允许 CREATE、ALTER 和 DROP 语句",
             }
 
         try:
-            self.connection.execute(sql)
+            self._execute(sql)
             self.connection.commit()
+            self._desc_cache.clear()
 
             return {"success": True, "message": "模式修改执行成功"}
         except Exception as e:
@@ -258,4 +585,7 @@ class DatabaseManager:
         if self.connection:
             self.connection.close()
             self.connection = None
+            self._cursor = None
             self.db_path = None
+            self._pragmas_applied = False
+            self._in_tx = False
@@ -1,6 +1,6 @@
 """本地 TursoDB MCP 服务。"""
 
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 from mcp.server.fastmcp import FastMCP
 from .database import DatabaseManager
 
@@ -58,17 +58,25 @@ def describe_table(table_name: str) -> dict[str, Any]:
 
 
 @mcp.tool()
-def execute_query(query: str, params: Optional[list] = None) -> dict[str, Any]:
+def execute_query(
+    query: str,
+    params: Optional[list] = None,
+    limit: Optional[int] = None,
+    format: Literal["rows", "columnar"] = "rows",
+) -> dict[str, Any]:
     """执行只读的 SELECT 查询。
 
     参数:
         query: 要执行的 SQL SELECT 或 PRAGMA 查询
         params: 可选的查询参数列表
+        limit: 可选的最大返回行数（超出时结果带 truncated=True）
+        format: 'rows' 返回字典列表；'columnar' 返回列式 data
+            （每列一个列表，宽结果集下比字典列表快数倍）
 
     返回:
-        包含查询结果（列和行）的字典
+        包含查询结果的字典
     """
-    return db_manager.execute_query(query, params)
+    return db_manager.execute_query(query, params, limit, format)
 
 
 @mcp.tool()
@@ -85,6 +93,20 @@ def insert_data(table: str, data: dict[str, Any]) -> dict[str, Any]:
     return db_manager.insert_data(table, data)
 
 
+@mcp.tool()
+def insert_many(table: str, rows: list[dict[str, Any]]) -> dict[str, Any]:
+    """在单个事务中批量插入多行数据。
+
+    参数:
+        table: 要插入数据的表名
+        rows: 字典列表，每个字典包含列名和值（所有行的列必须一致）
+
+    返回:
+        包含成功状态、插入行数和最后行 ID 的字典
+    """
+    return db_manager.insert_many(table, rows)
+
+
 @mcp.tool()
 def update_data(
     table: str, data: dict[str, Any], where: str, where_params: Optional[list] = None
@@ -120,6 +142,36 @@ def delete_data(
     return db_manager.delete_data(table, where, where_params)
 
 
+@mcp.tool()
+def begin_transaction() -> dict[str, Any]:
+    """开启显式事务，让后续写操作共享一次提交。
+
+    返回:
+        包含成功状态的字典
+    """
+    return db_manager.begin_transaction()
+
+
+@mcp.tool()
+def commit_transaction() -> dict[str, Any]:
+    """提交由 begin_transaction 开启的事务。
+
+    返回:
+        包含成功状态的字典
+    """
+    return db_manager.commit_transaction()
+
+
+@mcp.tool()
+def rollback_transaction() -> dict[str, Any]:
+    """回滚由 begin_transaction 开启的事务。
+
+    返回:
+        包含成功状态的字典
+    """
+    return db_manager.rollback_transaction()
+
+
 @mcp.tool()
 def schema_change(sql: str) -> dict[str, Any]:
     """执行模式修改语句（CREATE TABLE、ALTER TABLE、DROP TABLE）。